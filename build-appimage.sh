@@ -36,7 +36,7 @@ echo "[3/7] Creating clean venv and installing dependencies..."
 python3.10 -m venv "$PROJ/venv-build"
 source "$PROJ/venv-build/bin/activate"
 pip install --upgrade pip -q
-pip install faster-whisper sounddevice numpy pynput PyYAML -q
+pip install faster-whisper sounddevice numpy soxr pynput PyYAML -q
 # Copy system gi for GTK tray
 cp -r /usr/lib/python3/dist-packages/gi "$PROJ/venv-build/lib/python3.10/site-packages/" 2>/dev/null
 deactivate
@@ -42,6 +42,7 @@ pyinstaller ^
     --hidden-import=pynput.keyboard ^
     --hidden-import=pynput.keyboard._win32 ^
     --hidden-import=numpy ^
+    --hidden-import=soxr ^
     --hidden-import=PIL ^
     --hidden-import=yaml ^
     --collect-all faster_whisper ^
@@ -19,6 +19,7 @@ sudo apt-get install -y -qq \
     portaudio19-dev \
     xdotool \
     xclip \
+    python3-xlib \
     wtype \
     wl-clipboard \
     gir1.2-ayatanaappindicator3-0.1 \
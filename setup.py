@@ -11,6 +11,7 @@ setup(
         "faster-whisper>=1.0.0",
         "sounddevice>=0.4.6",
         "numpy>=1.24.0",
+        "soxr>=0.3.0",
         "pynput>=1.7.6",
         "PyYAML>=6.0",
         "pystray>=0.19.4",
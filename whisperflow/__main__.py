@@ -5,17 +5,12 @@ Works on both Linux and Windows.
 """
 
 import argparse
+import queue
 import signal
 import sys
 import threading
-import time
 
 from whisperflow.config import load_config, ensure_config_exists
-from whisperflow.audio import AudioRecorder, find_input_device
-from whisperflow.transcriber import Transcriber
-from whisperflow.hotkey import HotkeyListener
-from whisperflow.typer import type_text
-from whisperflow.tray import TrayIcon
 
 IS_WINDOWS = sys.platform == "win32"
 
@@ -24,8 +19,15 @@ class WhisperFlow:
     """Main application controller."""
 
     def __init__(self, config):
+        # Imported here so `--list-devices` and `--help` don't pay for
+        # faster-whisper, evdev/pynput and GTK at startup
+        from whisperflow.audio import AudioRecorder, find_input_device
+        from whisperflow.transcriber import Transcriber
+        from whisperflow.hotkey import HotkeyListener
+        from whisperflow.tray import TrayIcon
+
         self.config = config
-        self._running = False
+        self._stop_evt = threading.Event()
         self._transcribing = False
 
         # Initialize components
@@ -36,8 +38,10 @@ class WhisperFlow:
         )
         self.transcriber = Transcriber(
             model_size=config["model"],
+            device=config["inference_device"],
             compute_type=config["compute_type"],
             language=config["language"],
+            beam_size=config["beam_size"],
         )
         self.tray = TrayIcon()
         self.hotkey = HotkeyListener(
@@ -46,6 +50,12 @@ class WhisperFlow:
             on_deactivate=self._on_record_stop,
         )
 
+        # Single long-lived transcription worker fed by a queue, instead of
+        # spawning a new thread for every utterance
+        self._jobs = queue.Queue()
+        self._worker = threading.Thread(target=self._worker_loop, daemon=True)
+        self._worker.start()
+
     def _on_record_start(self):
         """Called when hotkey is pressed - start recording."""
         if self._transcribing:
@@ -66,21 +76,33 @@ class WhisperFlow:
             self.tray.set_idle()
             return
 
-        # Transcribe in background thread to avoid blocking hotkey listener
+        # Transcribe on the worker thread to avoid blocking hotkey listener
         self._transcribing = True
         self.tray.set_transcribing()
+        self._jobs.put((audio, duration))
+
+    def _worker_loop(self):
+        """Transcribe queued recordings until a None job is received."""
+        from whisperflow.typer import type_text_async
 
-        def _do_transcribe():
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            audio, duration = job
             try:
                 _log(f"Transcribing {duration:.1f}s of audio...")
                 text = self.transcriber.transcribe(audio)
                 if text:
                     _log(f"Result: {text}")
-                    type_text(
+                    typing = type_text_async(
                         text,
                         delay_ms=self.config["typing_delay_ms"],
+                        short_delay_ms=self.config["direct_typing_delay_ms"],
                         prepend_space=self.config["prepend_space"],
+                        preserve_clipboard=self.config["preserve_clipboard"],
                     )
+                    typing.add_done_callback(_report_typing_error)
                     self.tray.set_idle(last_text=text)
                 else:
                     _log("No speech detected")
@@ -91,16 +113,14 @@ class WhisperFlow:
             finally:
                 self._transcribing = False
 
-        threading.Thread(target=_do_transcribe, daemon=True).start()
-
     def run(self):
         """Start WhisperFlow."""
-        self._running = True
+        self._stop_evt.clear()
 
         # Pre-load the Whisper model
         _log("Loading Whisper model...")
-        self.transcriber._ensure_model()
-        _log("Model loaded!")
+        self.transcriber.warmup()
+        _log("Model loaded and warmed up!")
 
         # Start components
         self.tray.run(quit_callback=self.stop)
@@ -115,8 +135,12 @@ class WhisperFlow:
 
         # Keep main thread alive
         try:
-            while self._running:
-                time.sleep(0.1)
+            if IS_WINDOWS:
+                # A blocking wait can't be interrupted by Ctrl+C on Windows
+                while not self._stop_evt.wait(0.5):
+                    pass
+            else:
+                self._stop_evt.wait()
         except KeyboardInterrupt:
             pass
         finally:
@@ -125,14 +149,25 @@ class WhisperFlow:
     def stop(self):
         """Stop WhisperFlow."""
         _log("Shutting down...")
-        self._running = False
+        self._stop_evt.set()
         self.hotkey.stop()
+        self._jobs.put(None)
         self.recorder.close()
         self.tray.stop()
 
 
 def _log(msg):
-    print(f"[WhisperFlow] {msg}", flush=True)
+    out = sys.stdout
+    if out is None:  # Windowed (pythonw / PyInstaller --windowed) build
+        return
+    out.write(f"[WhisperFlow] {msg}\n")
+    out.flush()
+
+
+def _report_typing_error(future):
+    exc = future.exception()
+    if exc is not None:
+        _log(f"Typing error: {exc}")
 
 
 def main():
@@ -167,17 +202,24 @@ def main():
         import os
         session_type = os.environ.get("XDG_SESSION_TYPE", "")
         if not session_type:
-            try:
-                import subprocess
-                result = subprocess.run(
-                    ["loginctl", "show-session", "", "-p", "Type", "--value"],
-                    capture_output=True, text=True, timeout=2,
-                )
-                session_type = result.stdout.strip()
-                if session_type:
-                    os.environ["XDG_SESSION_TYPE"] = session_type
-            except Exception:
-                pass
+            # The display env vars are enough of a hint; only ask logind
+            # (a subprocess) when neither is set
+            if os.environ.get("WAYLAND_DISPLAY"):
+                session_type = "wayland"
+            elif os.environ.get("DISPLAY"):
+                session_type = "x11"
+            else:
+                try:
+                    import subprocess
+                    result = subprocess.run(
+                        ["loginctl", "show-session", "self", "-p", "Type", "--value"],
+                        capture_output=True, text=True, timeout=2,
+                    )
+                    session_type = result.stdout.strip()
+                except Exception:
+                    pass
+            if session_type:
+                os.environ["XDG_SESSION_TYPE"] = session_type
 
     if args.list_devices:
         import sounddevice as sd
@@ -8,10 +8,45 @@ import threading
 import numpy as np
 import sounddevice as sd
 
+# soxr provides a SIMD polyphase resampler; fall back to linear
+# interpolation if it isn't installed.
+HAS_SOXR = False
+try:
+    import soxr
+    HAS_SOXR = True
+except ImportError:
+    pass
+
+# Capture buffer is preallocated for this many seconds of audio
+MAX_UTTERANCE_SECONDS = 60
+
+# Shared result for empty recordings; read-only so no caller can mutate it
+_EMPTY_F32 = np.empty(0, dtype=np.float32)
+_EMPTY_F32.flags.writeable = False
+
+_devices_cache = None
+
+
+def _devices():
+    """Return the PortAudio device list, queried once per process."""
+    global _devices_cache
+    if _devices_cache is None:
+        _devices_cache = sd.query_devices()
+    return _devices_cache
+
+
+def clear_device_cache():
+    """Forget the cached device list so the next lookup re-queries PortAudio.
+
+    Call after devices may have been plugged in or removed.
+    """
+    global _devices_cache
+    _devices_cache = None
+
 
 def has_blue_yeti():
     """Check if a Blue Yeti mic is connected."""
-    devices = sd.query_devices()
+    devices = _devices()
     for d in devices:
         if "yeti" in d["name"].lower() and d["max_input_channels"] > 0:
             return True
@@ -41,73 +76,129 @@ def find_input_device(config_device):
         return int(config_device)
 
 
+def _resample(audio, src_sr, dst_sr):
+    """Resample a mono float32 array from src_sr to dst_sr.
+
+    Uses soxr's polyphase FIR ("QQ" quick quality for lowest latency)
+    when available, otherwise plain linear interpolation.
+    """
+    if HAS_SOXR:
+        return soxr.resample(audio, src_sr, dst_sr, quality="QQ")
+
+    target_len = int(len(audio) * dst_sr / src_sr)
+    # Positions stay float64: float32 can't place samples of a long
+    # recording exactly, and np.interp works in float64 regardless
+    indices = np.linspace(0, len(audio) - 1, target_len)
+    return np.interp(indices, np.arange(len(audio)), audio).astype(
+        np.float32, copy=False
+    )
+
+
 class AudioRecorder:
     """Records audio from microphone during push-to-talk.
 
-    Records at the device's native sample rate and resamples to 16kHz
-    for Whisper. Uses PulseAudio default device for best compatibility.
+    Asks PortAudio for 16kHz directly so any conversion happens in C. If
+    the device rejects that rate, records at its native rate and resamples
+    to 16kHz for Whisper. Uses PulseAudio default device for best
+    compatibility.
     """
 
     def __init__(self, device=None, sample_rate=16000):
         self.target_sr = sample_rate
         self.device = device
         self.channels = 1
-        self._buffer = []
-        self._recording = False
+        self._rec_evt = threading.Event()
+        # Bumped by start(); the callback resets the write index on the first
+        # block it sees for a new generation, so a block from the previous
+        # recording that is still in flight can't clobber the new one
+        self._gen = 0
+        self._cb_gen = 0
         self._stream = None
-        self._lock = threading.Lock()
+        self._lock = threading.Lock()  # Guards the InputStream lifecycle only
 
-        # Determine native sample rate
-        if device is not None:
-            info = sd.query_devices(device)
-            self.native_sr = info["default_samplerate"]
-        else:
-            # PulseAudio default handles resampling, so we can request 16kHz directly
-            self.native_sr = self.target_sr
+        # Capture rate; only differs from target_sr if the device refuses
+        # 16kHz and we fall back to its native rate (see _open_stream)
+        self.native_sr = self.target_sr
+
+        # Single contiguous capture buffer, sized for a typical utterance and
+        # grown by doubling if a recording runs longer.
+        self._alloc_buffer()
+
+    def _alloc_buffer(self):
+        self._buf = np.empty(int(self.native_sr * MAX_UTTERANCE_SECONDS), dtype=np.float32)
+        self._write = 0
 
     def _audio_callback(self, indata, frames, time_info, status):
         if status:
             pass  # Silently ignore xruns
-        if self._recording:
-            self._buffer.append(indata[:, 0].copy())
+        if self._rec_evt.is_set():
+            if self._cb_gen != self._gen:  # First block of a new recording
+                self._cb_gen = self._gen
+                self._write = 0
+            end = self._write + frames
+            if end > self._buf.size:
+                grown = np.empty(max(end, self._buf.size * 2), dtype=np.float32)
+                grown[:self._write] = self._buf[:self._write]
+                self._buf = grown
+            # Write straight into the buffer: no per-block copy, and for
+            # multi-channel input the downmix is fused into the same pass.
+            if self.channels == 1:
+                self._buf[self._write:end] = indata[:, 0]
+            else:
+                indata.mean(axis=1, dtype=np.float32, out=self._buf[self._write:end])
+            self._write = end
 
     def start(self):
         """Start recording audio."""
+        self._gen += 1
+        self._rec_evt.set()
         with self._lock:
-            self._buffer = []
-            self._recording = True
             if self._stream is None:
-                self._stream = sd.InputStream(
-                    device=self.device,
-                    samplerate=self.native_sr,
-                    channels=self.channels,
-                    dtype="float32",
-                    blocksize=int(self.native_sr * 0.1),  # 100ms blocks
-                    callback=self._audio_callback,
-                )
+                self._stream = self._open_stream()
                 self._stream.start()
 
+    def _open_stream(self):
+        """Open the input stream, preferring target_sr so PortAudio resamples."""
+        try:
+            return self._make_stream()
+        except sd.PortAudioError:
+            if self.device is None:
+                raise
+            # Device can't do 16kHz itself: record natively, resample in stop()
+            self.native_sr = _devices()[self.device]["default_samplerate"]
+            self._alloc_buffer()
+            return self._make_stream()
+
+    def _make_stream(self):
+        return sd.InputStream(
+            device=self.device,
+            samplerate=self.native_sr,
+            channels=self.channels,
+            dtype="float32",
+            blocksize=0,  # Let the host API pick its preferred block size
+            latency="low",
+            callback=self._audio_callback,
+        )
+
     def stop(self):
         """Stop recording and return the captured audio as float32 array at target sample rate."""
-        with self._lock:
-            self._recording = False
-            if not self._buffer:
-                return np.array([], dtype=np.float32)
-
-            audio = np.concatenate(self._buffer)
-            self._buffer = []
-
-            # Resample if needed
-            if abs(self.native_sr - self.target_sr) > 1:
-                # Simple linear interpolation resampling
-                duration = len(audio) / self.native_sr
-                target_len = int(duration * self.target_sr)
-                indices = np.linspace(0, len(audio) - 1, target_len)
-                audio = np.interp(indices, np.arange(len(audio)), audio).astype(
-                    np.float32
-                )
-
-            return audio
+        # The callback only touches the event, buffer and write index, so no
+        # lock is needed: a block still in flight lands past n and is dropped.
+        self._rec_evt.clear()
+        # No block has arrived since start(): _write still belongs to the
+        # previous recording
+        n = self._write if self._cb_gen == self._gen else 0
+        if n == 0:
+            return _EMPTY_F32
+
+        audio = self._buf[:n]
+
+        # Resample if needed (produces a new array); otherwise copy out
+        # so the capture buffer can be reused by the next recording
+        if abs(self.native_sr - self.target_sr) > 1:
+            return _resample(audio, self.native_sr, self.target_sr)
+
+        return audio.copy()
 
     def close(self):
         """Clean up the audio stream."""
@@ -4,18 +4,47 @@ import os
 import sys
 import yaml
 
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
 DEFAULT_CONFIG = {
     "hotkey": "ctrl+shift",
     "model": "base.en",
-    "compute_type": "int8",
+    "inference_device": "auto",
+    "compute_type": "auto",
     "audio_device": "auto",
     "sample_rate": 16000,
     "typing_delay_ms": 10,
+    "direct_typing_delay_ms": 0,
     "prepend_space": True,
+    "preserve_clipboard": False,
     "min_duration": 0.3,
     "language": "en",
+    "beam_size": 1,
 }
 
+# DEFAULT_CONFIG as yaml.dump(..., sort_keys=False) would emit it; written
+# verbatim on first run so creating the file doesn't need the YAML emitter.
+# Keep in sync with DEFAULT_CONFIG.
+_DEFAULT_CONFIG_YAML = """\
+hotkey: ctrl+shift
+model: base.en
+inference_device: auto
+compute_type: auto
+audio_device: auto
+sample_rate: 16000
+typing_delay_ms: 10
+direct_typing_delay_ms: 0
+prepend_space: true
+preserve_clipboard: false
+min_duration: 0.3
+language: en
+beam_size: 1
+"""
+
 if sys.platform == "win32":
     CONFIG_DIR = os.path.join(os.environ.get("APPDATA", os.path.expanduser("~")), "WhisperFlow")
 else:
@@ -31,7 +60,7 @@ def load_config(config_path=None):
     path = config_path or CONFIG_PATH
     if os.path.exists(path):
         with open(path) as f:
-            user_config = yaml.safe_load(f) or {}
+            user_config = yaml.load(f, Loader=_Loader) or {}
         config.update(user_config)
     else:
         # Create default config file
@@ -45,4 +74,4 @@ def ensure_config_exists():
     if not os.path.exists(CONFIG_PATH):
         os.makedirs(CONFIG_DIR, exist_ok=True)
         with open(CONFIG_PATH, "w") as f:
-            yaml.dump(DEFAULT_CONFIG, f, default_flow_style=False, sort_keys=False)
+            f.write(_DEFAULT_CONFIG_YAML)
@@ -7,6 +7,8 @@ Platform support:
 """
 
 import os
+import queue
+import selectors
 import sys
 import threading
 
@@ -74,13 +76,18 @@ def _find_keyboard():
     for path in evdev.list_devices():
         try:
             dev = evdev.InputDevice(path)
-            caps = dev.capabilities(verbose=False)
-            if ecodes.EV_KEY in caps:
-                keys = caps[ecodes.EV_KEY]
-                if ecodes.KEY_A in keys and ecodes.KEY_Z in keys:
-                    return dev
         except (PermissionError, OSError):
             continue
+        try:
+            keys = dev.capabilities().get(ecodes.EV_KEY)
+            if keys:
+                keys = set(keys)
+                if ecodes.KEY_A in keys and ecodes.KEY_Z in keys:
+                    return dev
+        except OSError:
+            pass
+        # Not a keyboard: release the fd instead of waiting for GC
+        dev.close()
     return None
 
 
@@ -115,14 +122,53 @@ class HotkeyListener:
         self.on_activate = on_activate or (lambda: None)
         self.on_deactivate = on_deactivate or (lambda: None)
         self._active = False
-        self._pressed_groups = [False] * len(self.key_groups)
+        # One bit per key group; the hotkey is active when all bits are set
+        self._pressed = 0
+        self._all_mask = (1 << len(self.key_groups)) - 1
+        # keycode (evdev) or Key (pynput) -> OR of the bits of every group it
+        # belongs to, so a key event is one dict lookup and one bitwise op
+        self._key_to_bits = {}
+        for i, group in enumerate(self.key_groups):
+            for code in group:
+                self._key_to_bits[code] = self._key_to_bits.get(code, 0) | (1 << i)
+                if IS_WINDOWS:
+                    # pynput sometimes reports a bare KeyCode instead of the
+                    # Key member, so index the virtual-key code as well
+                    vk = getattr(code.value, "vk", None)
+                    if vk is not None:
+                        self._key_to_bits[vk] = self._key_to_bits.get(vk, 0) | (1 << i)
+        # on_activate/on_deactivate run on their own thread so a slow callback
+        # never stalls the listener (on Windows, a low-level keyboard hook
+        # that blocks too long is silently removed by the OS)
+        self._callbacks = queue.SimpleQueue()
+        self._dispatcher = None
         self._thread = None
         self._running = False
         self._device = None  # Linux only
         self._listener = None  # Windows only
 
-    def _matches_group(self, keycode, group_idx):
-        return keycode in self.key_groups[group_idx]
+    def _on_key(self, bits, down):
+        """Apply a hotkey key press/release and fire on a state change."""
+        if down:
+            self._pressed |= bits
+        else:
+            self._pressed &= ~bits
+
+        active = self._pressed == self._all_mask
+        if active != self._active:
+            self._active = active
+            self._callbacks.put(self.on_activate if active else self.on_deactivate)
+
+    def _dispatch_loop(self):
+        """Run queued activate/deactivate callbacks in order until None."""
+        while True:
+            callback = self._callbacks.get()
+            if callback is None:
+                return
+            try:
+                callback()
+            except Exception as e:
+                print(f"[WhisperFlow] Hotkey callback error: {e}", flush=True)
 
     # ─── Linux (evdev) ──────────────────────────────────────────────────
 
@@ -138,75 +184,74 @@ class HotkeyListener:
 
         print(f"[WhisperFlow] Keyboard: {self._device.name}", flush=True)
 
-        try:
-            for event in self._device.read_loop():
-                if not self._running:
-                    break
-                if event.type != ecodes.EV_KEY:
-                    continue
-
-                keycode = event.code
-                if event.value == 1:  # key down
-                    for i in range(len(self.key_groups)):
-                        if self._matches_group(keycode, i):
-                            self._pressed_groups[i] = True
-
-                    was_active = self._active
-                    self._active = all(self._pressed_groups)
-                    if self._active and not was_active:
-                        self.on_activate()
+        # Wait for readiness, then drain every queued event with one read()
+        # instead of a syscall per event; the timeout lets stop() take effect
+        device = self._device  # stop() may clear the attribute under us
+        selector = selectors.DefaultSelector()
+        selector.register(device.fd, selectors.EVENT_READ)
 
-                elif event.value == 0:  # key up
-                    for i in range(len(self.key_groups)):
-                        if self._matches_group(keycode, i):
-                            self._pressed_groups[i] = False
+        # Bound once: this loop sees every keystroke on the system, and most
+        # are rejected by these two lookups alone
+        ev_key = ecodes.EV_KEY
+        lookup = self._key_to_bits.get
+        on_key = self._on_key
 
-                    was_active = self._active
-                    self._active = all(self._pressed_groups)
-                    if not self._active and was_active:
-                        self.on_deactivate()
+        try:
+            while self._running:
+                if not selector.select(timeout=0.1):
+                    continue
+                try:
+                    events = list(device.read())
+                except BlockingIOError:
+                    continue
 
-        except OSError:
+                for event in events:
+                    if not self._running:
+                        break
+                    if event.type != ev_key:
+                        continue
+                    value = event.value
+                    if value == 2:  # autorepeat while a key is held
+                        continue
+
+                    bits = lookup(event.code)
+                    if bits is None:
+                        continue
+                    on_key(bits, value == 1)  # 1 = key down, 0 = key up
+
+        except (OSError, ValueError):
             if self._running:
                 print("[WhisperFlow] Keyboard disconnected.", flush=True)
+        finally:
+            selector.close()
 
     # ─── Windows (pynput) ───────────────────────────────────────────────
 
-    def _normalize_key(self, key):
-        """Normalize a pynput key to match our key_groups sets."""
+    def _key_bits(self, key):
+        """Look up a pynput key, falling back to its virtual-key code."""
         # pynput gives us Key objects for special keys, KeyCode for regular keys
-        if hasattr(key, 'name'):
-            # It's a special key (Key.ctrl_l, Key.shift, etc.)
-            return key
-        return key
+        bits = self._key_to_bits.get(key)
+        if bits is None:
+            bits = self._key_to_bits.get(getattr(key, "vk", None), 0)
+        return bits
 
     def _on_press_windows(self, key):
-        key = self._normalize_key(key)
-        for i in range(len(self.key_groups)):
-            if key in self.key_groups[i]:
-                self._pressed_groups[i] = True
-
-        was_active = self._active
-        self._active = all(self._pressed_groups)
-        if self._active and not was_active:
-            self.on_activate()
+        bits = self._key_bits(key)
+        if bits:
+            self._on_key(bits, True)
 
     def _on_release_windows(self, key):
-        key = self._normalize_key(key)
-        for i in range(len(self.key_groups)):
-            if key in self.key_groups[i]:
-                self._pressed_groups[i] = False
-
-        was_active = self._active
-        self._active = all(self._pressed_groups)
-        if not self._active and was_active:
-            self.on_deactivate()
+        bits = self._key_bits(key)
+        if bits:
+            self._on_key(bits, False)
 
     # ─── Public API ─────────────────────────────────────────────────────
 
     def start(self):
         """Start listening for hotkeys in a background thread."""
         self._running = True
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, daemon=True)
+        self._dispatcher.start()
         if IS_WINDOWS:
             self._listener = pynput_keyboard.Listener(
                 on_press=self._on_press_windows,
@@ -221,6 +266,7 @@ class HotkeyListener:
     def stop(self):
         """Stop the hotkey listener."""
         self._running = False
+        self._callbacks.put(None)
         if IS_WINDOWS:
             if self._listener:
                 self._listener.stop()
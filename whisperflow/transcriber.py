@@ -1,65 +1,245 @@
 """Whisper transcription module for WhisperFlow.
 
-Uses faster-whisper with CTranslate2 backend for CPU-optimized inference.
+Uses faster-whisper with CTranslate2 backend for CPU-optimized inference,
+running on a CUDA GPU instead when one is available and usable.
 """
 
-import re
+import os
+import threading
 import numpy as np
 
 
-# Known Whisper hallucination patterns on silence/noise
-_HALLUCINATION_PATTERNS = [
-    r"^\s*$",
-    r"^(you|the|thank you|thanks for watching|subscribe)\.?$",
-    r"^\[.*\]$",  # [Music], [Silence], etc.
-    r"^\.+$",
-]
+# Known Whisper hallucinations on silence/noise (lowercased, with and
+# without a trailing period). Also rejected: empty text, "[Music]"-style
+# tags and runs of dots; see Transcriber._is_hallucination.
+_HALLUCINATED_PHRASES = frozenset(
+    phrase + suffix
+    for phrase in ("you", "the", "thank you", "thanks for watching", "subscribe")
+    for suffix in ("", ".")
+)
+
+# Lowest-precision compute types first; "auto" picks the first one the
+# installed CTranslate2 supports on the chosen device
+_COMPUTE_TYPE_PREFERENCE = {
+    "cuda": ("int8_float16", "int8", "float16", "float32"),
+    "cpu": ("int8", "int8_float32", "float32"),
+}
+
+# Silero VAD settings, and the least voiced audio (in samples at 16kHz)
+# worth running Whisper on
+_VAD_PARAMETERS = dict(min_silence_duration_ms=300, speech_pad_ms=200)
+_MIN_SPEECH_SAMPLES = int(0.2 * 16000)
+
+# Loaded models shared by all Transcriber instances, keyed by
+# (model_size, device, device_index, compute_type), so weights are only
+# held once
+_MODELS = {}
+_MODELS_LOCK = threading.Lock()
+
+# faster_whisper.WhisperModel and the Silero VAD helpers, imported on first
+# model load (the import pulls in CTranslate2) and pinned here afterwards
+_WhisperModel = None
+_get_speech_timestamps = None
+_collect_chunks = None
+_vad_options = None
+
+
+def _parse_device(device):
+    """Normalize a configured device to (name, index).
+
+    Accepts "auto", "cpu", "cuda" and "cuda:N", case-insensitively and
+    ignoring surrounding whitespace; raises ValueError for anything else.
+    """
+    name, _, index = str(device).strip().lower().partition(":")
+    if name not in ("auto", "cpu", "cuda") or (
+        index and (name != "cuda" or not index.isdigit())
+    ):
+        raise ValueError(
+            f"Invalid inference_device {device!r}: use auto, cpu, cuda or cuda:N"
+        )
+    return name, int(index or 0)
+
+
+def _detect_device():
+    """Return "cuda" if CTranslate2 can see a CUDA GPU, else "cpu"."""
+    try:
+        import ctranslate2
+        if ctranslate2.get_cuda_device_count() > 0:
+            return "cuda"
+    except Exception:
+        pass
+    return "cpu"
+
+
+def _detect_compute_type(device):
+    """Return the lowest-precision compute type supported on device."""
+    try:
+        import ctranslate2
+        supported = ctranslate2.get_supported_compute_types(device)
+    except Exception:
+        return "default"
+    for compute_type in _COMPUTE_TYPE_PREFERENCE.get(device, ("float32",)):
+        if compute_type in supported:
+            return compute_type
+    return "default"
 
 
 class Transcriber:
     """Manages Whisper model and transcription."""
 
-    def __init__(self, model_size="base.en", compute_type="int8", language="en"):
+    def __init__(self, model_size="base.en", compute_type="auto", language="en",
+                 beam_size=1, device="auto"):
         self.model_size = model_size
+        device, self.device_index = _parse_device(device)
+        self.device = _detect_device() if device == "auto" else device
+        if compute_type == "auto":
+            compute_type = _detect_compute_type(self.device)
         self.compute_type = compute_type
         self.language = language
+        self.beam_size = beam_size
         self._model = None
 
+    def _model_key(self):
+        return (self.model_size, self.device, self.device_index, self.compute_type)
+
     def _ensure_model(self):
-        """Lazy-load the model on first use."""
+        """Lazy-load the model on first use, on the CPU if CUDA fails."""
         if self._model is None:
-            from faster_whisper import WhisperModel
+            try:
+                self._load_model()
+            except Exception as e:
+                if self.device != "cuda":
+                    raise
+                self._use_cpu(e)
+                self._load_model()
+
+    def _load_model(self):
+        global _WhisperModel, _get_speech_timestamps, _collect_chunks, _vad_options
+        key = self._model_key()
+        with _MODELS_LOCK:
+            model = _MODELS.get(key)
+            if model is None:
+                if _WhisperModel is None:
+                    from faster_whisper import WhisperModel as _WhisperModel
+                    from faster_whisper.vad import (
+                        VadOptions,
+                        collect_chunks as _collect_chunks,
+                        get_speech_timestamps as _get_speech_timestamps,
+                    )
+                    _vad_options = VadOptions(**_VAD_PARAMETERS)
+
+                model = _WhisperModel(
+                    self.model_size,
+                    device=self.device,
+                    device_index=self.device_index,
+                    compute_type=self.compute_type,
+                    cpu_threads=os.cpu_count() or 0,
+                    num_workers=1,
+                )
+                _MODELS[key] = model
+        self._model = model
+
+    def _use_cpu(self, error):
+        """Switch to the CPU after the CUDA model failed to load or run.
+
+        A GPU can be visible to CTranslate2 while cuBLAS/cuDNN (not
+        shipped with faster-whisper) are missing; that only shows up once
+        the model is loaded or first run.
+        """
+        print(f"[WhisperFlow] CUDA unavailable ({error}); falling back to CPU.")
+        with _MODELS_LOCK:
+            _MODELS.pop(self._model_key(), None)
+        self._model = None
+        self.device = "cpu"
+        self.device_index = 0
+        self.compute_type = _detect_compute_type("cpu")
 
-            self._model = WhisperModel(
-                self.model_size,
-                device="cpu",
-                compute_type=self.compute_type,
-            )
+    def warmup(self):
+        """Push a second of silence through the model.
+
+        The first real transcription otherwise pays for one-time setup
+        (VAD model load, CTranslate2 buffers) on the user's first press.
+        If the model fails to run on CUDA, it is reloaded on the CPU (a
+        failed load is handled the same way in _ensure_model()).
+        """
+        try:
+            self._warmup()
+        except Exception as e:
+            if self.device != "cuda":
+                raise
+            self._use_cpu(e)
+            self._warmup()
+
+    def _warmup(self):
+        self._ensure_model()
+        silence = np.zeros(16000, dtype=np.float32)
+        # Load the Silero model, then run the encoder and decoder (VAD
+        # would drop silence before it reached them)
+        self._voiced_audio(silence)
+        segments, _ = self._model.transcribe(silence, **self._decode_options())
+        for _ in segments:
+            pass
+
+    def _decode_options(self):
+        """Keyword arguments for WhisperModel.transcribe(), shared by
+        transcribe() and warmup() so startup warms the real decode path.
+
+        Push-to-talk clips are short and self-contained: decode greedily by
+        default and skip timestamp tokens and temperature fallback. VAD has
+        already run in _voiced_audio().
+        """
+        return dict(
+            beam_size=self.beam_size,
+            language=self.language,
+            temperature=0.0,
+            condition_on_previous_text=False,
+            without_timestamps=True,
+            vad_filter=False,
+        )
+
+    def _voiced_audio(self, audio):
+        """Run Silero VAD and return only the speech chunks, joined.
+
+        Pauses longer than min_silence_duration_ms are cut out, as
+        vad_filter=True would do. Returns None when there is less than
+        _MIN_SPEECH_SAMPLES of speech.
+        """
+        speech = _get_speech_timestamps(audio, _vad_options)
+        voiced = sum(chunk["end"] - chunk["start"] for chunk in speech)
+        if voiced < _MIN_SPEECH_SAMPLES:
+            return None
+        chunks = _collect_chunks(audio, speech)
+        if isinstance(chunks, tuple):  # faster-whisper >= 1.1: (chunks, metadata)
+            chunks = np.concatenate(chunks[0])
+        return chunks
 
     def transcribe(self, audio):
         """Transcribe audio array to text.
 
         Args:
-            audio: numpy float32 array at 16kHz.
+            audio: 1-D numpy array at 16kHz. Contiguous float32 (what
+                AudioRecorder produces) is passed through as-is; anything
+                else is converted once here.
 
         Returns:
             Transcribed text string, or empty string if no speech detected.
         """
-        if len(audio) < 1600:  # Less than 0.1s
+        if audio.dtype != np.float32 or not audio.flags.c_contiguous:
+            audio = np.ascontiguousarray(audio, dtype=np.float32)
+
+        if audio.shape[0] < 1600:  # Less than 0.1s
             return ""
 
         self._ensure_model()
 
-        segments, info = self._model.transcribe(
-            audio,
-            beam_size=5,
-            language=self.language,
-            vad_filter=True,
-            vad_parameters=dict(
-                min_silence_duration_ms=300,
-                speech_pad_ms=200,
-            ),
-        )
+        # VAD first: silent or accidental presses never reach the encoder,
+        # and the rest are cut down to their speech chunks so the model
+        # doesn't need to repeat VAD itself
+        audio = self._voiced_audio(audio)
+        if audio is None:
+            return ""
+
+        segments, info = self._model.transcribe(audio, **self._decode_options())
 
         text = " ".join(seg.text.strip() for seg in segments).strip()
 
@@ -74,7 +254,8 @@ class Transcriber:
         text_lower = text.lower().strip()
         if not text_lower:
             return True
-        for pattern in _HALLUCINATION_PATTERNS:
-            if re.match(pattern, text_lower, re.IGNORECASE):
-                return True
-        return False
+        if text_lower in _HALLUCINATED_PHRASES:
+            return True
+        if text_lower[0] == "[" and text_lower[-1] == "]":  # [Music], [Silence], etc.
+            return True
+        return not text_lower.strip(".")
@@ -44,12 +44,20 @@ class TrayIcon:
     ICON_RECORDING = "media-record-symbolic"
     ICON_TRANSCRIBING = "emblem-synchronizing-symbolic"
 
+    # Rendered Windows icon images, keyed by state (they never change)
+    _ICON_CACHE = {}
+
     def __init__(self):
         self._indicator = None  # Linux GTK
         self._status_item = None  # Linux GTK
         self._icon = None  # Windows pystray
         self._thread = None
         self._quit_callback = None
+        # Latest (icon_name, status_text) waiting to be drawn on the GTK
+        # thread; only the newest request is drawn
+        self._pending_icon = None
+        self._idle_scheduled = False
+        self._pending_lock = threading.Lock()
 
         if IS_WINDOWS and HAS_PYSTRAY:
             self._init_windows()
@@ -85,8 +93,17 @@ class TrayIcon:
     # ─── Windows pystray init ───────────────────────────────────────────
 
     def _init_windows(self):
-        # Icon will be created on run() since pystray.Icon.run() blocks
-        pass
+        # Icon will be created on run() since pystray.Icon.run() blocks;
+        # render the images now so the first state change is instant
+        for state in ("idle", "recording", "transcribing"):
+            self._get_win_icon(state)
+
+    def _get_win_icon(self, state="idle"):
+        """Return the cached tray image for state, rendering it on first use."""
+        image = self._ICON_CACHE.get(state)
+        if image is None:
+            image = self._ICON_CACHE[state] = self._create_win_icon(state)
+        return image
 
     def _create_win_icon(self, state="idle"):
         """Create a colored icon image for the Windows system tray."""
@@ -147,17 +164,30 @@ class TrayIcon:
     # ─── Linux icon updates ─────────────────────────────────────────────
 
     def _update_icon_linux(self, icon_name, status_text):
-        """Thread-safe icon update via GLib.idle_add."""
+        """Thread-safe icon update via GLib.idle_add.
+
+        Rapid state changes collapse into one redraw of the latest state.
+        """
         if not self._indicator:
             return
 
-        def _do_update():
-            self._indicator.set_icon_full(icon_name, status_text)
-            if self._status_item:
-                self._status_item.set_label(status_text)
-            return False
+        with self._pending_lock:
+            self._pending_icon = (icon_name, status_text)
+            if self._idle_scheduled:
+                return
+            self._idle_scheduled = True
+        GLib.idle_add(self._flush_pending_icon)
+
+    def _flush_pending_icon(self):
+        with self._pending_lock:
+            icon_name, status_text = self._pending_icon
+            self._pending_icon = None
+            self._idle_scheduled = False
 
-        GLib.idle_add(_do_update)
+        self._indicator.set_icon_full(icon_name, status_text)
+        if self._status_item:
+            self._status_item.set_label(status_text)
+        return False
 
     def _on_quit_linux(self, _widget):
         if self._quit_callback:
@@ -169,7 +199,7 @@ class TrayIcon:
     def _update_icon_windows(self, state, title):
         """Update the Windows tray icon image and tooltip."""
         if self._icon:
-            self._icon.icon = self._create_win_icon(state)
+            self._icon.icon = self._get_win_icon(state)
             self._icon.title = title
 
     def _on_quit_windows(self, icon, item):
@@ -189,7 +219,7 @@ class TrayIcon:
             )
             self._icon = pystray.Icon(
                 "whisperflow",
-                self._create_win_icon("idle"),
+                self._get_win_icon("idle"),
                 "WhisperFlow: Idle",
                 menu,
             )
@@ -2,163 +2,512 @@
 
 Platform support:
   - Linux/Wayland: wtype (direct) or wl-copy + wtype ctrl+v (clipboard)
-  - Linux/X11: xdotool + xclip (clipboard paste)
-  - Windows: ctypes SendInput (clipboard paste via Ctrl+V)
+  - Linux/X11: libxdo or xdotool + xclip (clipboard paste)
+  - Windows: ctypes SendInput (Unicode keystrokes, or clipboard paste via Ctrl+V)
 """
 
+import concurrent.futures
+import ctypes
 import os
+import re
 import sys
 import subprocess
-import shutil
+import threading
 import time
 
 IS_WINDOWS = sys.platform == "win32"
 
+# python-xlib lets us ask the X server for the focused window's WM_CLASS
+# directly; without it we fall back to xdotool + xprop subprocesses
+HAS_XLIB = False
+if not IS_WINDOWS:
+    try:
+        from Xlib import display as xdisplay
+        HAS_XLIB = True
+    except ImportError:
+        pass
+
+# libxdo is the library behind xdotool (Debian's xdotool package pulls in
+# libxdo3). Calling it in-process keeps one X connection open and skips a
+# fork/exec per injection; without it we run the xdotool binary.
+HAS_LIBXDO = False
+if not IS_WINDOWS:
+    try:
+        _libxdo = ctypes.CDLL("libxdo.so.3")
+        _libxdo.xdo_new.argtypes = [ctypes.c_char_p]
+        _libxdo.xdo_new.restype = ctypes.c_void_p
+        _libxdo.xdo_enter_text_window.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong, ctypes.c_char_p, ctypes.c_uint,
+        ]
+        _libxdo.xdo_send_keysequence_window.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong, ctypes.c_char_p, ctypes.c_uint,
+        ]
+        _libxdo.xdo_get_active_modifiers.argtypes = [
+            ctypes.c_void_p, ctypes.POINTER(ctypes.c_void_p),
+            ctypes.POINTER(ctypes.c_int),
+        ]
+        _libxdo.xdo_clear_active_modifiers.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong, ctypes.c_void_p, ctypes.c_int,
+        ]
+        _libxdo.xdo_set_active_modifiers.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong, ctypes.c_void_p, ctypes.c_int,
+        ]
+        _libc_free = ctypes.CDLL(None).free
+        _libc_free.argtypes = [ctypes.c_void_p]
+        HAS_LIBXDO = True
+    except (OSError, AttributeError):
+        pass
+
+# Lowercased WM_CLASS names (instance or class) of windows that need special
+# handling. Matched exactly against the parsed WM_CLASS tokens, so e.g.
+# "foot" or "rio" can't hit an unrelated app that merely contains them.
+_TERMS = frozenset([
+    "gnome-terminal", "gnome-terminal-server", "org.gnome.console", "kgx",
+    "org.gnome.ptyxis", "ptyxis", "xfce4-terminal", "mate-terminal",
+    "lxterminal", "qterminal", "io.elementary.terminal", "deepin-terminal",
+    "konsole", "org.kde.konsole", "yakuake", "xterm", "uxterm", "urxvt",
+    "rxvt", "st", "st-256color", "alacritty", "kitty", "terminator", "tilix",
+    "com.gexperts.tilix", "sakura", "guake", "tilda", "foot", "footclient",
+    "wezterm", "org.wezfurlong.wezterm", "hyper", "tabby", "rio", "ghostty",
+    "com.mitchellh.ghostty", "contour", "terminology", "termite",
+    "cool-retro-term", "blackbox", "com.raggesilver.blackbox",
+])
+_REMOTES = frozenset([
+    "vncviewer", "tigervnc", "realvnc-vncviewer", "tightvnc", "ssvnc",
+    "remmina", "org.remmina.remmina", "vinagre", "krdc", "org.kde.krdc",
+    "xfreerdp", "wlfreerdp", "sdl-freerdp", "rdesktop",
+    "org.gnome.connections", "x2goclient",
+])
+
+# Runs text injection for type_text_async(); one worker keeps successive
+# utterances (and their clipboard use) in order
+_TYPER = concurrent.futures.ThreadPoolExecutor(
+    max_workers=1, thread_name_prefix="wf-typer"
+)
+
+# Restores the user's previous clipboard off the typing path
+_CLIPBOARD_RESTORER = concurrent.futures.ThreadPoolExecutor(
+    max_workers=1, thread_name_prefix="wf-clipboard"
+)
+
+
+def _probe(cmds):
+    """Map each command name to whether it is an executable on PATH.
+
+    One PATH split for all commands and one access() per candidate,
+    stopping at the first hit; only a hit pays for the is-a-file check.
+    """
+    dirs = [d for d in os.environ.get("PATH", os.defpath).split(os.pathsep) if d]
+
+    def found(path):
+        return os.access(path, os.X_OK) and os.path.isfile(path)
+
+    return {cmd: any(found(os.path.join(d, cmd)) for d in dirs) for cmd in cmds}
+
+
+# Tool availability and session type don't change while we run, so probe
+# them once at import. __main__ imports this module only after it has
+# filled in XDG_SESSION_TYPE.
+_TOOLS = {} if IS_WINDOWS else _probe(
+    ("wtype", "wl-copy", "wl-paste", "xdotool", "xclip", "xprop")
+)
+_SESSION = "wayland" if (
+    os.environ.get("XDG_SESSION_TYPE") == "wayland"
+    or os.environ.get("WAYLAND_DISPLAY") is not None
+) else "x11"
+
+
+def type_text(text, delay_ms=10, prepend_space=True, preserve_clipboard=False,
+              coalesce=False, short_delay_ms=0):
+    """Type text at the current cursor position in the focused window.
+
+    The clipboard paste paths only save and restore the user's previous
+    clipboard when preserve_clipboard is set; the restore runs in the
+    background so this returns as soon as the paste is sent.
+
+    delay_ms is the per-key delay when text has to be typed key by key;
+    short_delay_ms applies instead to short text typed in place of a paste
+    (see _is_short_ascii).
+
+    With coalesce=True the text is buffered for _COALESCE_WINDOW seconds
+    and typed together with any other coalesced calls in that window, in
+    one injection; this returns without waiting for it.
+    """
+    if not text:
+        return
 
-def _has(cmd):
-    return shutil.which(cmd) is not None
+    if prepend_space:
+        # A single short str copy; a separate space keystroke would cost an
+        # extra injection call, and a clipboard paste must carry it anyway
+        text = " " + text
 
+    if coalesce:
+        _queue_coalesced(text, delay_ms, preserve_clipboard, short_delay_ms)
+        return
 
-def _is_wayland():
-    return os.environ.get("XDG_SESSION_TYPE") == "wayland" or \
-           os.environ.get("WAYLAND_DISPLAY") is not None
+    _TYPE_FN(text, delay_ms, preserve_clipboard, short_delay_ms)
 
 
-def type_text(text, delay_ms=10, prepend_space=True):
-    """Type text at the current cursor position in the focused window."""
-    if not text:
-        return
+# Coalesced type_text() calls waiting for the flush timer; the settings of
+# the most recent call apply to the whole batch
+_COALESCE_WINDOW = 0.010
+_pending = []
+_pending_opts = None
+_pending_timer = None
+_pending_lock = threading.Lock()
 
-    if prepend_space:
-        text = " " + text
 
+def _queue_coalesced(text, delay_ms, preserve_clipboard, short_delay_ms):
+    global _pending_opts, _pending_timer
+    with _pending_lock:
+        _pending.append(text)
+        _pending_opts = (delay_ms, preserve_clipboard, short_delay_ms)
+        if _pending_timer is None:
+            _pending_timer = threading.Timer(_COALESCE_WINDOW, _flush_coalesced)
+            _pending_timer.daemon = True
+            _pending_timer.start()
+
+
+def _flush_coalesced():
+    """Type everything buffered so far as one injection on the typer thread."""
+    global _pending_timer
+    with _pending_lock:
+        text = "".join(_pending)
+        _pending.clear()
+        opts = _pending_opts
+        _pending_timer = None
+    # Through _TYPER so the batch stays ordered with type_text_async() calls
+    future = _TYPER.submit(_TYPE_FN, text, *opts)
+    future.add_done_callback(_report_coalesced_error)
+
+
+def _report_coalesced_error(future):
+    # No caller holds this Future, so surface failures here
+    exc = future.exception()
+    if exc is not None:
+        print(f"[WhisperFlow] Typing error: {exc}")
+
+
+def _pick_backend():
+    """Choose the typing backend for this platform and session."""
     if IS_WINDOWS:
-        _type_windows(text)
-    elif _is_wayland() and _has("xdotool"):
-        _type_x11(text, delay_ms)
-    elif _is_wayland():
-        _type_wayland(text, delay_ms)
-    else:
-        _type_x11(text, delay_ms)
+        return _type_windows
+    if _SESSION == "wayland" and not _TOOLS["xdotool"]:
+        return _type_wayland
+    return _type_x11
 
 
-# ─── Windows ────────────────────────────────────────────────────────────────
+def _is_short_ascii(text):
+    """Short single-line ASCII is typed directly instead of pasted.
 
-def _type_windows(text):
-    """Type on Windows using clipboard paste (Ctrl+V) via ctypes."""
-    import ctypes
-    from ctypes import wintypes
+    Keystroke injection handles it reliably and it spares the clipboard
+    round-trip (and the user's clipboard contents). It is typed with
+    short_delay_ms between keys (direct_typing_delay_ms in the config).
+    """
+    return len(text) <= 64 and text.isascii() and "\n" not in text
 
-    user32 = ctypes.windll.user32
-    kernel32 = ctypes.windll.kernel32
 
-    # --- Save old clipboard ---
-    old_clipboard = None
-    CF_UNICODETEXT = 13
-    GMEM_MOVEABLE = 0x0002
+def _set_clipboard(args, data, proc=None):
+    """Feed raw bytes to a clipboard tool (wl-copy/xclip) on stdin.
 
-    if user32.OpenClipboard(0):
-        h = user32.GetClipboardData(CF_UNICODETEXT)
-        if h:
-            kernel32.GlobalLock.restype = ctypes.c_void_p
-            ptr = kernel32.GlobalLock(h)
-            if ptr:
-                old_clipboard = ctypes.wstring_at(ptr)
-                kernel32.GlobalUnlock(h)
-        user32.CloseClipboard()
+    Waits for the tool's foreground process to exit, which happens once it
+    owns the selection, so a paste sent afterwards gets the new content.
+    proc may be a tool already started with _spawn_clipboard().
+    """
+    if proc is None:
+        proc = _spawn_clipboard(args)
+    try:
+        proc.stdin.write(data)
+        proc.stdin.close()
+    except BrokenPipeError:
+        pass
+    try:
+        proc.wait(timeout=2)
+    except subprocess.TimeoutExpired:
+        # Don't leave a hung tool behind (subprocess.run() killed it too)
+        proc.kill()
+        proc.wait()
+        raise
 
-    # --- Set new clipboard text ---
-    if user32.OpenClipboard(0):
-        user32.EmptyClipboard()
-        # Encode text as UTF-16LE for Windows clipboard
-        encoded = text.encode("utf-16-le") + b"\x00\x00"
-        h_mem = kernel32.GlobalAlloc(GMEM_MOVEABLE, len(encoded))
-        kernel32.GlobalLock.restype = ctypes.c_void_p
-        ptr = kernel32.GlobalLock(h_mem)
-        ctypes.memmove(ptr, encoded, len(encoded))
-        kernel32.GlobalUnlock(h_mem)
-        user32.SetClipboardData(CF_UNICODETEXT, h_mem)
-        user32.CloseClipboard()
-    else:
-        return
 
-    # --- Send Ctrl+V via SendInput ---
-    time.sleep(0.05)  # Small delay for clipboard to settle
-    _send_ctrl_v()
+def _spawn_clipboard(args):
+    """Start a clipboard tool that will set the selection from stdin.
 
-    # --- Restore old clipboard ---
-    if old_clipboard is not None:
-        time.sleep(0.1)
-        if user32.OpenClipboard(0):
-            user32.EmptyClipboard()
-            encoded = old_clipboard.encode("utf-16-le") + b"\x00\x00"
-            h_mem = kernel32.GlobalAlloc(GMEM_MOVEABLE, len(encoded))
-            kernel32.GlobalLock.restype = ctypes.c_void_p
-            ptr = kernel32.GlobalLock(h_mem)
-            ctypes.memmove(ptr, encoded, len(encoded))
-            kernel32.GlobalUnlock(h_mem)
-            user32.SetClipboardData(CF_UNICODETEXT, h_mem)
-            user32.CloseClipboard()
+    wl-copy and xclip only claim the selection once stdin hits EOF, so the
+    process can be started ahead of time, e.g. while the old contents are
+    still being read.
+    """
+    return subprocess.Popen(args, stdin=subprocess.PIPE)
 
 
-def _send_ctrl_v():
-    """Send Ctrl+V keystroke using SendInput on Windows."""
-    import ctypes
+def _swap_clipboard(set_args, read_args, data):
+    """Set the clipboard to data, first reading its old contents if
+    read_args is given; returns those bytes (or None).
+
+    The setter is spawned before the read so the two startups overlap; if
+    anything fails before it has been fed, it is killed rather than left
+    waiting on stdin.
+    """
+    if read_args is None:
+        _set_clipboard(set_args, data)
+        return None
+
+    proc = _spawn_clipboard(set_args)
+    try:
+        old = _read_clipboard(read_args)
+        _set_clipboard(set_args, data, proc)
+    except BaseException:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+        raise
+    return old
+
+
+def _read_clipboard(args):
+    """Return the clipboard's current contents as bytes, or None."""
+    try:
+        return subprocess.run(args, capture_output=True, timeout=2).stdout
+    except Exception:
+        return None
+
+
+def type_text_async(text, **kwargs):
+    """Queue type_text() on the typer thread and return its Future.
+
+    Lets the caller move on (e.g. to the next transcription) while the
+    typing subprocesses run. Call .result() on the Future to wait.
+    """
+    return _TYPER.submit(type_text, text, **kwargs)
+
+
+# Future of the last queued clipboard restore; the next paste waits for it
+# so the restore can't overwrite that paste or be read back as "old" content
+_pending_restore = None
+
+
+def _restore_clipboard_later(args, data):
+    """Put data back on the clipboard once the paste has had time to land."""
+    def _restore():
+        time.sleep(0.1)  # Let the target app read the pasted text first
+        _set_clipboard(args, data)
+
+    _queue_restore(_restore)
+
+
+def _queue_restore(fn, *args):
+    global _pending_restore
+    _pending_restore = _CLIPBOARD_RESTORER.submit(fn, *args)
+
+
+def _wait_for_restore():
+    """Block until the previous paste's clipboard restore has finished."""
+    global _pending_restore
+    if _pending_restore is not None:
+        try:
+            _pending_restore.result()
+        except Exception:
+            pass  # A failed restore must not block this paste
+        _pending_restore = None
+
+
+# ─── Windows ────────────────────────────────────────────────────────────────
+
+if IS_WINDOWS:
     from ctypes import wintypes
 
+    user32 = ctypes.windll.user32
+    kernel32 = ctypes.windll.kernel32
+
+    CF_UNICODETEXT = 13
+    GMEM_MOVEABLE = 0x0002
     INPUT_KEYBOARD = 1
     KEYEVENTF_KEYUP = 0x0002
+    KEYEVENTF_UNICODE = 0x0004
     VK_CONTROL = 0x11
     VK_V = 0x56
 
+    # Full INPUT union: SendInput rejects calls whose cbSize doesn't match
+    # the real sizeof(INPUT), which the mouse member determines on x64
+    class MOUSEINPUT(ctypes.Structure):
+        _fields_ = [
+            ("dx", wintypes.LONG),
+            ("dy", wintypes.LONG),
+            ("mouseData", wintypes.DWORD),
+            ("dwFlags", wintypes.DWORD),
+            ("time", wintypes.DWORD),
+            ("dwExtraInfo", ctypes.c_size_t),
+        ]
+
     class KEYBDINPUT(ctypes.Structure):
         _fields_ = [
             ("wVk", wintypes.WORD),
             ("wScan", wintypes.WORD),
             ("dwFlags", wintypes.DWORD),
             ("time", wintypes.DWORD),
-            ("dwExtraInfo", ctypes.POINTER(ctypes.c_ulong)),
+            ("dwExtraInfo", ctypes.c_size_t),
+        ]
+
+    class HARDWAREINPUT(ctypes.Structure):
+        _fields_ = [
+            ("uMsg", wintypes.DWORD),
+            ("wParamL", wintypes.WORD),
+            ("wParamH", wintypes.WORD),
         ]
 
     class INPUT(ctypes.Structure):
         class _INPUT(ctypes.Union):
-            _fields_ = [("ki", KEYBDINPUT)]
+            _fields_ = [
+                ("mi", MOUSEINPUT),
+                ("ki", KEYBDINPUT),
+                ("hi", HARDWAREINPUT),
+            ]
+        _anonymous_ = ("_input",)
         _fields_ = [
             ("type", wintypes.DWORD),
             ("_input", _INPUT),
         ]
 
-    def _make_key_input(vk, flags=0):
-        inp = INPUT()
-        inp.type = INPUT_KEYBOARD
-        inp._input.ki.wVk = vk
-        inp._input.ki.wScan = 0
-        inp._input.ki.dwFlags = flags
-        inp._input.ki.time = 0
-        inp._input.ki.dwExtraInfo = None
+    _INPUT_SIZE = ctypes.sizeof(INPUT)
+
+    user32.OpenClipboard.argtypes = [wintypes.HWND]
+    user32.OpenClipboard.restype = wintypes.BOOL
+    user32.GetClipboardData.argtypes = [wintypes.UINT]
+    user32.GetClipboardData.restype = wintypes.HANDLE
+    user32.SetClipboardData.argtypes = [wintypes.UINT, wintypes.HANDLE]
+    user32.SetClipboardData.restype = wintypes.HANDLE
+    user32.SendInput.argtypes = [wintypes.UINT, ctypes.POINTER(INPUT), ctypes.c_int]
+    user32.SendInput.restype = wintypes.UINT
+    user32.GetClipboardSequenceNumber.restype = wintypes.DWORD
+    kernel32.GlobalAlloc.argtypes = [wintypes.UINT, ctypes.c_size_t]
+    kernel32.GlobalAlloc.restype = wintypes.HGLOBAL
+    kernel32.GlobalLock.argtypes = [wintypes.HGLOBAL]
+    kernel32.GlobalLock.restype = ctypes.c_void_p
+    kernel32.GlobalUnlock.argtypes = [wintypes.HGLOBAL]
+    kernel32.GlobalFree.argtypes = [wintypes.HGLOBAL]
+    kernel32.GlobalFree.restype = wintypes.HGLOBAL
+
+    def _key_input(vk, flags=0):
+        inp = INPUT(type=INPUT_KEYBOARD)
+        inp.ki.wVk = vk
+        inp.ki.dwFlags = flags
         return inp
 
-    # Ctrl down, V down, V up, Ctrl up
-    inputs = [
-        _make_key_input(VK_CONTROL),
-        _make_key_input(VK_V),
-        _make_key_input(VK_V, KEYEVENTF_KEYUP),
-        _make_key_input(VK_CONTROL, KEYEVENTF_KEYUP),
-    ]
+    # Ctrl down, V down, V up, Ctrl up; built once and reused for every paste
+    _CTRL_V_INPUTS = (INPUT * 4)(
+        _key_input(VK_CONTROL),
+        _key_input(VK_V),
+        _key_input(VK_V, KEYEVENTF_KEYUP),
+        _key_input(VK_CONTROL, KEYEVENTF_KEYUP),
+    )
+
+
+def _set_clipboard_windows(text):
+    """Replace the clipboard with text as CF_UNICODETEXT.
+
+    Must be called with the clipboard open.
+    """
+    # NUL-terminated UTF-16LE, encoded in one pass
+    encoded = (text + "\0").encode("utf-16-le")
+    h_mem = kernel32.GlobalAlloc(GMEM_MOVEABLE, len(encoded))
+    if not h_mem:
+        return
+    ptr = kernel32.GlobalLock(h_mem)
+    ctypes.memmove(ptr, encoded, len(encoded))
+    kernel32.GlobalUnlock(h_mem)
+    user32.EmptyClipboard()
+    # The system owns h_mem once this succeeds; on failure it's still ours
+    if not user32.SetClipboardData(CF_UNICODETEXT, h_mem):
+        kernel32.GlobalFree(h_mem)
+
+
+def _type_windows(text, delay_ms=10, preserve_clipboard=False, short_delay_ms=0):
+    """Type on Windows via SendInput: short text as Unicode keystrokes,
+    anything else by clipboard paste (Ctrl+V).
+
+    The old clipboard is read and the new text set in one OpenClipboard
+    session. delay_ms and short_delay_ms are unused: both are sent as a
+    single SendInput batch.
+    """
+    if len(text) <= 64 and "\n" not in text:
+        _send_unicode(text)
+        return
+
+    _wait_for_restore()
+    old_clipboard = None
+    if not user32.OpenClipboard(None):
+        return
+    try:
+        if preserve_clipboard:
+            h = user32.GetClipboardData(CF_UNICODETEXT)
+            if h:
+                ptr = kernel32.GlobalLock(h)
+                if ptr:
+                    old_clipboard = ctypes.wstring_at(ptr)
+                    kernel32.GlobalUnlock(h)
+        _set_clipboard_windows(text)
+    finally:
+        user32.CloseClipboard()
+    # Remember which clipboard change is ours so the restore can tell if
+    # anything else has written to it since
+    seq = user32.GetClipboardSequenceNumber()
+
+    # The data is fully in place once CloseClipboard returns, so the
+    # paste can go out straight away
+    _send_ctrl_v()
+
+    if old_clipboard is not None:
+        _queue_restore(_restore_clipboard_windows, old_clipboard, seq)
+
+
+def _restore_clipboard_windows(text, seq):
+    """Put text back on the clipboard unless it changed after change seq."""
+    time.sleep(0.1)  # Let the target app read the pasted text first
+    if user32.GetClipboardSequenceNumber() == seq and user32.OpenClipboard(None):
+        try:
+            _set_clipboard_windows(text)
+        finally:
+            user32.CloseClipboard()
+
+
+def _send_unicode(text):
+    """Type text as KEYEVENTF_UNICODE key events in one SendInput call.
+
+    Each UTF-16 code unit gets a down and an up event, so characters
+    outside the BMP go out as their surrogate pair.
+    """
+    units = memoryview(text.encode("utf-16-le")).cast("H")
+    inputs = (INPUT * (2 * len(units)))()
+    for i, unit in enumerate(units):
+        down = inputs[2 * i]
+        up = inputs[2 * i + 1]
+        down.type = up.type = INPUT_KEYBOARD
+        down.ki.wScan = up.ki.wScan = unit
+        down.ki.dwFlags = KEYEVENTF_UNICODE
+        up.ki.dwFlags = KEYEVENTF_UNICODE | KEYEVENTF_KEYUP
+    user32.SendInput(len(inputs), inputs, _INPUT_SIZE)
+
 
-    arr = (INPUT * len(inputs))(*inputs)
-    ctypes.windll.user32.SendInput(len(inputs), arr, ctypes.sizeof(INPUT))
+def _send_ctrl_v():
+    """Send Ctrl+V keystroke using SendInput on Windows."""
+    user32.SendInput(4, _CTRL_V_INPUTS, _INPUT_SIZE)
 
 
 # ─── Linux / Wayland ────────────────────────────────────────────────────────
 
-def _type_wayland(text, delay_ms):
+def _type_wayland(text, delay_ms, preserve_clipboard=False, short_delay_ms=0):
     """Type on Wayland using wtype or wl-clipboard fallback."""
-    if _has("wl-copy") and _has("wtype"):
-        _wayland_clipboard_paste(text)
-    elif _has("wtype"):
+    if _TOOLS["wl-copy"] and _TOOLS["wtype"]:
+        if _is_short_ascii(text):
+            subprocess.run(
+                ["wtype", "-d", str(short_delay_ms), "--", text],
+                check=False, timeout=30,
+            )
+        else:
+            _wayland_clipboard_paste(text, preserve_clipboard)
+    elif _TOOLS["wtype"]:
         subprocess.run(
-            ["wtype", "-d", str(delay_ms), text],
+            ["wtype", "-d", str(delay_ms), "--", text],
             check=False, timeout=30,
         )
     else:
@@ -167,123 +516,234 @@ def _type_wayland(text, delay_ms):
         )
 
 
-def _wayland_clipboard_paste(text):
+def _wayland_clipboard_paste(text, preserve_clipboard=False):
     """Paste via Wayland clipboard for best Unicode support."""
-    try:
-        old = subprocess.run(
-            ["wl-paste", "--no-newline"],
-            capture_output=True, text=True, timeout=2,
-        ).stdout
-    except Exception:
-        old = None
-
-    subprocess.run(
-        ["wl-copy", "--", text],
-        check=False, timeout=2,
-    )
+    # An explicit MIME type stops wl-copy from spawning xdg-mime to sniff it
+    copy_args = ["wl-copy", "--type", "text/plain;charset=utf-8"]
+    _wait_for_restore()
+    read_args = None
+    if preserve_clipboard and _TOOLS["wl-paste"]:
+        read_args = ["wl-paste", "--no-newline"]
+    old = _swap_clipboard(copy_args, read_args, text.encode("utf-8"))
     subprocess.run(
         ["wtype", "-M", "ctrl", "-P", "v", "-p", "v", "-m", "ctrl"],
         check=False, timeout=5,
     )
 
     if old is not None:
-        time.sleep(0.1)
-        subprocess.run(
-            ["wl-copy", "--", old],
-            check=False, timeout=2,
-        )
+        _restore_clipboard_later(copy_args, old)
 
 
 # ─── Linux / X11 ────────────────────────────────────────────────────────────
 
+# (monotonic timestamp, value) of the last subprocess WM_CLASS probe
+_wm_class_cache = (float("-inf"), ())
+_WM_CLASS_TTL = 0.25
+
+# Long-lived Xlib connection and (window id, timestamp, value) of the last
+# window looked up through it
+_xdpy = None
+_xlib_cache = (None, float("-inf"), ())
+_XLIB_CACHE_TTL = 1.0
+
+
 def _get_focused_wm_class():
-    """Return the WM_CLASS string of the focused window, or empty string."""
+    """Return the focused window's lowercased WM_CLASS tokens, or ()."""
+    global _xdpy
+    if HAS_XLIB:
+        try:
+            return _xlib_wm_class()
+        except Exception:
+            # Drop the connection (closing its socket) and reconnect next
+            # time; use the subprocess path now
+            if _xdpy is not None:
+                try:
+                    _xdpy.close()
+                except Exception:
+                    pass
+            _xdpy = None
+    return _subprocess_wm_class()
+
+
+def _xlib_wm_class():
+    """Look up the focused window's WM_CLASS over a persistent X connection.
+
+    One get_input_focus round-trip per call; the class itself is cached
+    per window id for _XLIB_CACHE_TTL seconds.
+    """
+    global _xdpy, _xlib_cache
+    if _xdpy is None:
+        _xdpy = xdisplay.Display()
+
+    win = _xdpy.get_input_focus().focus
+    if isinstance(win, int):  # X.NONE / X.PointerRoot: nothing focused
+        return ()
+
+    now = time.monotonic()
+    cached_id, ts, value = _xlib_cache
+    if cached_id == win.id and now - ts < _XLIB_CACHE_TTL:
+        return value
+
+    # The focused window is often a client-side child without WM_CLASS;
+    # walk up to the top-level window that carries it
+    focus_id = win.id
+    wm_class = None
+    while True:
+        wm_class = win.get_wm_class()
+        if wm_class:
+            break
+        tree = win.query_tree()
+        parent = tree.parent
+        if not parent or parent.id in (0, tree.root.id):
+            break
+        win = parent
+
+    value = tuple(c.lower() for c in wm_class) if wm_class else ()
+    _xlib_cache = (focus_id, now, value)
+    return value
+
+
+def _subprocess_wm_class():
+    """WM_CLASS via xdotool + xprop.
+
+    Results are reused for _WM_CLASS_TTL seconds so back-to-back checks
+    within one injection don't re-probe the X server.
+    """
+    global _wm_class_cache
+    now = time.monotonic()
+    ts, value = _wm_class_cache
+    if now - ts < _WM_CLASS_TTL:
+        return value
+
     try:
-        win_id = subprocess.run(
-            ["xdotool", "getactivewindow"],
-            capture_output=True, text=True, timeout=2,
-        ).stdout.strip()
+        # One spawn from Python instead of two sequential round-trips
         result = subprocess.run(
-            ["xprop", "-id", win_id, "WM_CLASS"],
+            ["sh", "-c", 'xprop -id "$(xdotool getactivewindow)" WM_CLASS'],
             capture_output=True, text=True, timeout=2,
         )
-        return result.stdout.strip().lower()
+        # WM_CLASS(STRING) = "instance", "Class"
+        value = tuple(t.lower() for t in re.findall(r'"([^"]*)"', result.stdout))
     except Exception:
-        return ""
-
-
-def _is_terminal_focused(wm_class=None):
-    """Check if the currently focused window is a terminal emulator."""
-    if wm_class is None:
-        wm_class = _get_focused_wm_class()
-    terminal_keywords = [
-        "terminal", "konsole", "xterm", "urxvt", "alacritty",
-        "kitty", "terminator", "tilix", "sakura", "guake",
-        "tilda", "foot", "wezterm", "hyper", "tabby", "rio",
-        "ghostty", "contour", "lxterminal", "st-256color",
-    ]
-    return any(kw in wm_class for kw in terminal_keywords)
-
-
-def _is_remote_viewer_focused(wm_class=None):
-    """Check if the focused window is a VNC/RDP viewer where clipboard paste won't work."""
-    if wm_class is None:
-        wm_class = _get_focused_wm_class()
-    remote_keywords = [
-        "vncviewer", "tigervnc", "realvnc", "tightvnc",
-        "remmina", "vinagre", "krdc", "xfreerdp", "rdesktop",
-    ]
-    return any(kw in wm_class for kw in remote_keywords)
-
-
-def _type_x11(text, delay_ms):
-    """Type on X11 using xdotool."""
-    if not _has("xdotool"):
+        value = ()
+    _wm_class_cache = (now, value)
+    return value
+
+
+def _is_terminal_focused(wm_class):
+    """Check if a WM_CLASS from _get_focused_wm_class() is a terminal emulator.
+
+    Known class names are an exact set lookup; anything else still counts
+    if it mentions "term" (wezterm-gui, custom classes, ...), since pasting
+    into an unrecognized terminal with plain Ctrl+V does nothing.
+    """
+    if not _TERMS.isdisjoint(wm_class):
+        return True
+    return any("term" in c for c in wm_class)
+
+
+def _is_remote_viewer_focused(wm_class):
+    """Check if a WM_CLASS is a VNC/RDP viewer where clipboard paste won't work."""
+    return not _REMOTES.isdisjoint(wm_class)
+
+
+# libxdo handle, opened on first use; xdo_t is not thread-safe
+_xdo = None
+_xdo_lock = threading.Lock()
+_CURRENTWINDOW = 0
+
+
+def _xdo_handle():
+    """Return the shared xdo_t, or None if libxdo can't reach the X server."""
+    global _xdo
+    if _xdo is None:
+        _xdo = _libxdo.xdo_new(None) or 0  # 0: tried and failed, don't retry
+    return _xdo or None
+
+
+def _xdo_call(name, payload, delay_ms):
+    """Run a libxdo *_window function with --clearmodifiers semantics.
+
+    Returns False if libxdo is unavailable so the caller can use xdotool.
+    """
+    if not HAS_LIBXDO:
+        return False
+    with _xdo_lock:
+        xdo = _xdo_handle()
+        if xdo is None:
+            return False
+        # Release held modifiers (the hotkey may still be down) while
+        # typing, then put them back, as xdotool --clearmodifiers does
+        keys = ctypes.c_void_p()
+        nkeys = ctypes.c_int()
+        _libxdo.xdo_get_active_modifiers(xdo, ctypes.byref(keys), ctypes.byref(nkeys))
+        try:
+            _libxdo.xdo_clear_active_modifiers(xdo, _CURRENTWINDOW, keys, nkeys)
+            getattr(_libxdo, name)(
+                xdo, _CURRENTWINDOW, payload.encode("utf-8"), delay_ms * 1000
+            )
+            _libxdo.xdo_set_active_modifiers(xdo, _CURRENTWINDOW, keys, nkeys)
+        finally:
+            _libc_free(keys)
+    return True
+
+
+def _x11_type(text, delay_ms):
+    """Type text into the focused X window."""
+    if not _xdo_call("xdo_enter_text_window", text, delay_ms):
+        # "--" so dictated text starting with "-" isn't read as an option
+        _xdotool("type", "--clearmodifiers", "--delay", str(delay_ms), "--", text,
+                 timeout=30)
+
+
+def _x11_key(sequence):
+    """Send a key sequence such as "ctrl+v" to the focused X window."""
+    if not _xdo_call("xdo_send_keysequence_window", sequence, 12):
+        _xdotool("key", "--clearmodifiers", sequence)
+
+
+def _xdotool(*args, timeout=5):
+    """Run one xdotool command.
+
+    Fallback for _x11_type()/_x11_key() when libxdo isn't available; the
+    whole keystroke sequence for an utterance is a single xdotool process.
+    """
+    subprocess.run(
+        ["xdotool", *args],
+        stdin=subprocess.DEVNULL, check=False, timeout=timeout,
+    )
+
+
+def _type_x11(text, delay_ms, preserve_clipboard=False, short_delay_ms=0):
+    """Type on X11 using libxdo, or the xdotool binary without it."""
+    if not _TOOLS["xdotool"] and not HAS_LIBXDO:
         raise RuntimeError(
             "xdotool not found. Install it: sudo apt install xdotool"
         )
 
+    # The only focus probe for this injection; both checks below reuse it
     wm_class = _get_focused_wm_class()
 
     if _is_remote_viewer_focused(wm_class):
-        subprocess.run(
-            ["xdotool", "type", "--clearmodifiers", "--delay",
-             str(max(delay_ms, 12)), text],
-            check=False, timeout=30,
-        )
+        _x11_type(text, max(delay_ms, 12))
         return
 
-    if _has("xclip"):
-        try:
-            old = subprocess.run(
-                ["xclip", "-selection", "clipboard", "-o"],
-                capture_output=True, text=True, timeout=2,
-            ).stdout
-        except Exception:
-            old = None
-
-        subprocess.run(
-            ["xclip", "-selection", "clipboard"],
-            input=text, text=True, timeout=2, check=False,
+    if _TOOLS["xclip"] and not _is_short_ascii(text):
+        _wait_for_restore()
+        read_args = None
+        if preserve_clipboard:
+            read_args = ["xclip", "-selection", "clipboard", "-o"]
+        old = _swap_clipboard(
+            ["xclip", "-selection", "clipboard"], read_args, text.encode("utf-8")
         )
-        if _is_terminal_focused(wm_class):
-            subprocess.run(
-                ["xdotool", "key", "--clearmodifiers", "ctrl+shift+v"],
-                check=False, timeout=5,
-            )
-        else:
-            subprocess.run(
-                ["xdotool", "key", "--clearmodifiers", "ctrl+v"],
-                check=False, timeout=5,
-            )
+        paste = "ctrl+shift+v" if _is_terminal_focused(wm_class) else "ctrl+v"
+        _x11_key(paste)
         if old is not None:
-            time.sleep(0.1)
-            subprocess.run(
-                ["xclip", "-selection", "clipboard"],
-                input=old, text=True, timeout=2, check=False,
-            )
+            _restore_clipboard_later(["xclip", "-selection", "clipboard"], old)
+    elif _TOOLS["xclip"]:
+        _x11_type(text, short_delay_ms)
     else:
-        subprocess.run(
-            ["xdotool", "type", "--clearmodifiers", "--delay", str(delay_ms), text],
-            check=False, timeout=30,
-        )
+        _x11_type(text, delay_ms)
+
+
+# Resolved once, after all backends above are defined
+_TYPE_FN = _pick_backend()